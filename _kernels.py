@@ -0,0 +1,56 @@
+"""
+Numba-compiled kernels for validating batches of pre-parsed formula values
+"""
+try:
+    from numba import njit
+except ImportError:
+    # Without numba the kernels still work, just as interpreted loops
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+@njit(cache=True)
+def lower_bounds_batch(operands, enabled, strict, valid):
+    """
+    Mark each submission valid when every enabled operand is > 0 (strict) or >= 0
+    """
+    for i in range(operands.shape[1]):
+        ok = True
+        for j in range(operands.shape[0]):
+            if enabled[j]:
+                if strict[j]:
+                    ok = ok and operands[j, i] > 0
+                else:
+                    ok = ok and operands[j, i] >= 0
+        valid[i] = ok
+
+@njit(cache=True)
+def newton_batch(m, a, out):
+    """
+    F = m * a for each submission
+    """
+    for i in range(m.shape[0]):
+        out[i] = m[i] * a[i]
+
+@njit(cache=True)
+def kinetic_energy_batch(m, v, out):
+    """
+    KE = 0.5 * m * v^2 for each submission
+    """
+    for i in range(m.shape[0]):
+        out[i] = 0.5 * m[i] * (v[i] * v[i])
+
+@njit(cache=True)
+def ohms_law_batch(current, resistance, out):
+    """
+    V = I * R for each submission
+    """
+    for i in range(current.shape[0]):
+        out[i] = current[i] * resistance[i]
+
+@njit(cache=True)
+def ideal_gas_law_batch(n, R, T, out):
+    """
+    PV = n * R * T for each submission
+    """
+    for i in range(n.shape[0]):
+        out[i] = n[i] * R[i] * T[i]
@@ -0,0 +1,10 @@
+# Production server settings: gunicorn -c gunicorn.conf.py
+import multiprocessing
+
+wsgi_app = 'smart_physics_tutor:app'
+bind = '0.0.0.0:8000'
+
+# Mastery level, the validation cache and the rate limiter all live in process memory,
+# so serve from a single worker process and scale with threads instead
+workers = 1
+threads = 2 * multiprocessing.cpu_count() + 1
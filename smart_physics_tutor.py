@@ -1,25 +1,224 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+import orjson
 import owlready2
+import functools
+import importlib.util
+from collections import namedtuple
+from dataclasses import dataclass
 import re
 import os
-import numpy as np
+import sqlite3
+import threading
+import types
+
+# Hardcoded ontology path
+_ONTOLOGY_PATH = os.path.join(os.path.dirname(__file__), 'smart_physics_tutor.owl')
+_ONTOLOGY_BASENAME = os.path.basename(_ONTOLOGY_PATH)
+
+# SQLite quadstore used to cache the parsed ontology between runs
+ONTOLOGY_CACHE_FILENAME = 'physics_tutor.sqlite3'
+
+# Any whitespace, which the ontology patterns allow around every token
+_WHITESPACE_RE = re.compile(r'\s')
+
+# Number of distinct (formula_type, formula) results kept by the validation cache
+VALIDATION_CACHE_SIZE = 4096
+
+# Longest formula accepted by /validate; anything longer is rejected before validation
+MAX_FORMULA_LENGTH = 128
+
+# Malformed /validate requests a client may make before being throttled
+VALIDATE_RATE_LIMIT = "60/minute"
+
+# Ontology value constraints that enable a numeric check, keyed by check name
+_CONSTRAINT_CHECKS = {
+    'mass_positive': 'Mass (m) must be a positive number greater than 0',
+    'velocity_nonneg': 'Velocity (v) must be non-negative',
+    'current_nonneg': 'Current (I) must be non-negative',
+    'resistance_positive': 'Resistance (R) must be a positive number greater than 0',
+    'moles_positive': 'Number of Moles (n) must be a positive number greater than 0',
+    'gas_constant_positive': 'Gas Constant (R) must be a positive number greater than 0',
+    'temperature_nonneg': 'Temperature (T) must be non-negative (absolute temperature in Kelvin)'
+}
+
+# One operand of a formula and the ontology check (if any) that requires it to be
+# positive (strict) or non-negative; the batch kernels read the same fields
+VariableSpec = namedtuple('VariableSpec', 'name check strict error', defaults=(None, False, None))
+
+# Fixed shape of a formula: prefix, operands separated by '*', suffix, and how to compute the result
+FormulaSpec = namedtuple('FormulaSpec', 'label prefix suffix variables compute')
+
+_FORMULAS = {
+    'NewtonSecondLawValidator': FormulaSpec(
+        "Newton's Second Law", 'F=', '',
+        (
+            VariableSpec('mass', 'mass_positive', True, "Mass must be a positive number greater than 0"),
+            VariableSpec('acceleration')
+        ),
+        lambda v: v['mass'] * v['acceleration']
+    ),
+    'KineticEnergyValidator': FormulaSpec(
+        "Kinetic Energy", 'KE=0.5*', '^2',
+        (
+            VariableSpec('mass', 'mass_positive', True, "Mass must be a positive number greater than 0"),
+            VariableSpec('velocity', 'velocity_nonneg', False, "Velocity must be non-negative")
+        ),
+        lambda v: 0.5 * v['mass'] * (v['velocity'] ** 2)
+    ),
+    'OhmsLawValidator': FormulaSpec(
+        "Ohm's Law", 'V=', '',
+        (
+            VariableSpec('current', 'current_nonneg', False, "Current must be non-negative"),
+            VariableSpec('resistance', 'resistance_positive', True,
+                         "Resistance must be a positive number greater than 0")
+        ),
+        lambda v: v['current'] * v['resistance']
+    ),
+    'IdealGasLawValidator': FormulaSpec(
+        "Ideal Gas Law", 'PV=', '',
+        (
+            VariableSpec('n', 'moles_positive', True,
+                         "Number of moles must be a positive number greater than 0"),
+            VariableSpec('R', 'gas_constant_positive', True,
+                         "Gas constant must be a positive number greater than 0"),
+            VariableSpec('T', 'temperature_nonneg', False,
+                         "Temperature must be non-negative (absolute temperature in Kelvin)")
+        ),
+        lambda v: v['n'] * v['R'] * v['T']
+    )
+}
+
+# Batch kernel (by name in _kernels) computing each formula; its operands and checks follow _FORMULAS
+_BATCH_KERNELS = {
+    'NewtonSecondLawValidator': 'newton_batch',
+    'KineticEnergyValidator': 'kinetic_energy_batch',
+    'OhmsLawValidator': 'ohms_law_batch',
+    'IdealGasLawValidator': 'ideal_gas_law_batch'
+}
+
+# Why a formula failed validation; a constraint failure is a well-formed wrong answer
+FAILURE_UNSUPPORTED = 'unsupported'
+FAILURE_MALFORMED = 'malformed'
+FAILURE_CONSTRAINT = 'constraint'
+
+class ConstraintError(ValueError):
+    """
+    A well-formed formula whose values break an ontology constraint
+    """
+
+def _scan_number(text):
+    """
+    Convert an unsigned decimal such as '12' or '3.5' to float, rejecting anything else
+    """
+    # float() alone would also accept signs, exponents, 'nan' and 'inf'
+    whole, dot, fraction = text.partition('.')
+    if not whole.isdigit() or (dot and not fraction.isdigit()):
+        raise ValueError(f"Invalid number: {text}")
+    return float(text)
+
+@dataclass(slots=True, frozen=True)
+class ValidatorSpec:
+    """
+    Per-formula rules resolved from the ontology for the request path
+    """
+    formula: FormulaSpec
+    formula_pattern: str
+    formula_pattern_re: re.Pattern
+    messages_joined: str
+    mass_positive: bool = False
+    velocity_nonneg: bool = False
+    current_nonneg: bool = False
+    resistance_positive: bool = False
+    moles_positive: bool = False
+    gas_constant_positive: bool = False
+    temperature_nonneg: bool = False
 
 class PhysicsFormulaValidator:
-    def __init__(self, ontology_path):
+    __slots__ = ('ontology', 'validators', '_specs', '_strategies', '_validate_cached')
+    
+    def __init__(self, ontology_path, cache_path=None):
         """
         Initialize the validator with the OWL ontology file
         """
         try:
             # Load the ontology
-            self.ontology = owlready2.get_ontology(f"file://{ontology_path}").load()
+            if cache_path is None:
+                cache_path = os.path.join(os.path.dirname(ontology_path), ONTOLOGY_CACHE_FILENAME)
+            self.ontology = self.load_ontology(ontology_path, cache_path)
             
             # Extract validation rules for different formulas
-            self.validators = {}
             self.extract_all_validation_rules()
+            
+            # Bind each formula type to its validation strategy once, rather than per request
+            self._strategies = {
+                formula_type: functools.partial(self._validate, spec)
+                for formula_type, spec in self._specs.items()
+            }
+            
+            # Validation is a pure function of the rules, so repeat submissions are memoized
+            self._validate_cached = functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)(self._validate_pure)
         except Exception as e:
             print(f"Ontology Loading Error: {str(e)}")
             raise
         
+    def load_ontology(self, ontology_path, cache_path):
+        """
+        Load the ontology, reusing the SQLite quadstore cache when it is newer than the OWL file
+        """
+        try:
+            return self.load_cached_ontology(ontology_path, cache_path)
+        except (OSError, sqlite3.Error) as e:
+            # e.g. a read-only application directory; the cache is only an optimization
+            print(f"Ontology Cache Warning: cannot use {cache_path} ({str(e)}), parsing in memory")
+            return owlready2.World().get_ontology(f"file://{ontology_path}").load()
+        
+    def load_cached_ontology(self, ontology_path, cache_path):
+        """
+        Load the ontology through the SQLite quadstore cache, rebuilding it when stale
+        """
+        # The ontology's own IRI is recorded next to the cache, since it differs from the file IRI
+        iri_path = f"{cache_path}.iri"
+        cache_is_fresh = (os.path.exists(cache_path) and os.path.exists(iri_path) and
+                          os.path.getmtime(cache_path) >= os.path.getmtime(ontology_path))
+        
+        # Discard a stale cache and parse the OWL file into a fresh quadstore, then release it
+        if not cache_is_fresh:
+            for path in (cache_path, iri_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            
+            # Create the cache file up front so an unwritable location fails cleanly with OSError
+            open(cache_path, 'wb').close()
+            world = owlready2.World(filename=cache_path, exclusive=False)
+            try:
+                ontology = world.get_ontology(f"file://{ontology_path}").load()
+                world.save()
+                with open(iri_path, 'w') as iri_file:
+                    iri_file.write(ontology.base_iri)
+            finally:
+                world.close()
+        
+        # Each validator reads through its own read-only world, so several can share one cache
+        with open(iri_path) as iri_file:
+            iri = iri_file.read()
+        world = owlready2.World(filename=cache_path, exclusive=False, read_only=True)
+        try:
+            return world.get_ontology(iri).load()
+        except Exception:
+            world.close()
+            raise
+    
+    def close(self):
+        """
+        Close the quadstore connection behind the ontology
+        
+        The extracted rules stay usable; only the ontology itself can no longer be queried.
+        """
+        self.ontology.world.close()
+        
     def extract_all_validation_rules(self):
         """
         Extract comprehensive validation rules for all physics formulas in the ontology
@@ -33,15 +232,42 @@ class PhysicsFormulaValidator:
                 'IdealGasLawValidator'
             ]
             
+            validators = {}
+            specs = {}
             for validator_name in formula_validators:
-                validator = list(self.ontology.search(iri=f"*{validator_name}"))[0]
+                # Direct lookup by local name instead of a wildcard search over all entities
+                validator = self.ontology[validator_name]
+                if validator is None:
+                    raise ValueError(f"Validator {validator_name} not found in ontology")
+                formula_pattern = self.get_property_value(validator, 'hasFormulaPattern')
+                validation_rules = tuple(self.get_property_values(validator, 'hasValidationRule'))
+                unit_constraints = tuple(self.get_property_values(validator, 'hasUnitConstraint'))
+                value_constraints = tuple(self.get_property_values(validator, 'hasValueConstraint'))
+                
+                # Rules are fixed once extracted, so they are stored read-only
+                validators[validator_name] = types.MappingProxyType({
+                    'formula_pattern': formula_pattern,
+                    'validation_rules': validation_rules,
+                    'unit_constraints': unit_constraints,
+                    'value_constraints': value_constraints
+                })
                 
-                self.validators[validator_name] = {
-                    'formula_pattern': self.get_property_value(validator, 'hasFormulaPattern'),
-                    'validation_rules': self.get_property_values(validator, 'hasValidationRule'),
-                    'unit_constraints': self.get_property_values(validator, 'hasUnitConstraint'),
-                    'value_constraints': self.get_property_values(validator, 'hasValueConstraint')
-                }
+                # Resolve the compiled pattern, the joined messages and the enabled numeric checks once
+                value_constraints_set = frozenset(str(c) for c in value_constraints)
+                specs[validator_name] = ValidatorSpec(
+                    formula=_FORMULAS[validator_name],
+                    formula_pattern=formula_pattern,
+                    formula_pattern_re=re.compile(formula_pattern),
+                    messages_joined="\n".join(map(str, validation_rules + unit_constraints + value_constraints)),
+                    **{
+                        check: constraint in value_constraints_set
+                        for check, constraint in _CONSTRAINT_CHECKS.items()
+                    }
+                )
+            
+            # Only the public rules are frozen; the private specs stay plain dicts for fast lookups
+            self.validators = types.MappingProxyType(validators)
+            self._specs = specs
         except Exception as e:
             print(f"Rule Extraction Error: {str(e)}")
             raise
@@ -67,207 +293,218 @@ class PhysicsFormulaValidator:
             print(f"Property Retrieval Warning: Could not retrieve {property_name}: {str(e)}")
             return []
         
-    def validate_formula(self, formula_type, formula):
+    def validate_formula(self, formula_type, formula, format_message=True):
         """
         Validate different physics formulas using ontology rules
+        
+        Pass format_message=False when only the validity is needed to skip building the success message.
+        """
+        is_valid, message, _ = self.check_formula(formula_type, formula, format_message)
+        return is_valid, message
+    
+    def check_formula(self, formula_type, formula, format_message=True):
+        """
+        Validate a formula like validate_formula, also returning why it failed
+        
+        The third item is None for a valid formula, otherwise one of the FAILURE_* kinds.
+        """
+        # Strip whitespace so equivalent submissions share a cache entry; most input has none
+        if _WHITESPACE_RE.search(formula):
+            formula = _WHITESPACE_RE.sub('', formula)
+        return self._validate_cached(formula_type, formula, format_message)
+    
+    def _validate_pure(self, formula_type, formula, format_message=True):
+        """
+        Validate a whitespace-free formula; the result depends only on its arguments
         """
         # Validate against ontology-defined formula pattern
-        validator_info = self.validators.get(formula_type)
-        if not validator_info:
-            return False, "Unsupported formula type"
+        spec = self._specs.get(formula_type)
+        if not spec:
+            return False, "Unsupported formula type", FAILURE_UNSUPPORTED
         
         # Check formula pattern
-        formula_pattern = validator_info['formula_pattern']
-        if not re.match(formula_pattern, formula.replace(' ', '')):
-            return False, f"Formula must match pattern: {formula_pattern}"
+        if not spec.formula_pattern_re.match(formula):
+            return False, f"Formula must match pattern: {spec.formula_pattern}", FAILURE_MALFORMED
         
         # Validate variables
         try:
             calculation_result, parsed_values = self.parse_and_validate_values(formula_type, formula)
             
-            # Prepare validation messages
-            validation_messages = (
-                validator_info.get('validation_rules', []) + 
-                validator_info.get('unit_constraints', []) +
-                validator_info.get('value_constraints', [])
-            )
-            
-            result_message = f"Calculation Successful! Result = {calculation_result:.2f}\n"
-            result_message += "\n".join(validation_messages)
+            if format_message:
+                result_message = (
+                    f"Calculation Successful! Result = {calculation_result:.2f}\n"
+                    f"{spec.messages_joined}"
+                )
+            else:
+                result_message = ""
             
-            return True, result_message
+            return True, result_message, None
         
+        except ConstraintError as ce:
+            return False, str(ce), FAILURE_CONSTRAINT
         except ValueError as ve:
-            return False, str(ve)
+            return False, str(ve), FAILURE_MALFORMED
         except Exception as e:
-            return False, f"Validation Error: {str(e)}"
+            return False, f"Validation Error: {str(e)}", FAILURE_MALFORMED
     
-    def parse_and_validate_values(self, formula_type, formula):
-        """
-        Parse and validate formula values dynamically based on ontology constraints
+    def validate_batch(self, formula_type, *operands):
         """
-        # Remove spaces for consistent parsing
-        formula = formula.replace(' ', '')
-        
-        # Mapping of validation logic for each formula type
-        validation_strategies = {
-            'NewtonSecondLawValidator': self._validate_newton_second_law,
-            'KineticEnergyValidator': self._validate_kinetic_energy,
-            'OhmsLawValidator': self._validate_ohms_law,
-            'IdealGasLawValidator': self._validate_ideal_gas_law
-        }
-        
-        # Get the appropriate validation strategy
-        strategy = validation_strategies.get(formula_type)
-        if not strategy:
-            raise ValueError("No validation strategy found")
+        Validate arrays of already-parsed operands (e.g. a class's submissions) in one pass
         
-        return strategy(formula)
-    
-    def _validate_newton_second_law(self, formula):
+        Returns a (results, valid) pair of arrays; parsing must happen before this call.
+        Non-finite operands are reported as invalid.
         """
-        Validate Newton's Second Law formula with ontology constraints
-        """
-        # Regex to extract mass and acceleration
-        match = re.match(r'F=(\d+(\.\d+)?)\*(\d+(\.\d+)?)', formula)
-        
-        if not match:
-            raise ValueError("Invalid Newton's Second Law formula")
-        
-        mass = float(match.group(1))
-        acceleration = float(match.group(3))
-        
-        # Apply value constraints from ontology
-        validator_info = self.validators.get('NewtonSecondLawValidator', {})
-        value_constraints = validator_info.get('value_constraints', [])
-        
-        # Check mass constraint
-        if 'Mass (m) must be a positive number greater than 0' in value_constraints:
-            if mass <= 0:
-                raise ValueError("Mass must be a positive number greater than 0")
-        
-        # Calculate force
-        force = mass * acceleration
-        return force, {'mass': mass, 'acceleration': acceleration}
+        # numpy and numba are only needed here, so keep them out of application start-up
+        import numpy as np
+        import _kernels
+        
+        if formula_type not in _BATCH_KERNELS:
+            raise ValueError("Unsupported formula type")
+        
+        spec = self._specs[formula_type]
+        variables = spec.formula.variables
+        if len(operands) != len(variables):
+            raise ValueError(f"{formula_type} expects {len(variables)} operand arrays")
+        
+        arrays = [np.ascontiguousarray(operand, dtype=np.float64) for operand in operands]
+        if any(array.ndim != 1 for array in arrays):
+            raise ValueError("Operand arrays must be one-dimensional")
+        if any(array.shape != arrays[0].shape for array in arrays):
+            raise ValueError("Operand arrays must all have the same length")
+        
+        finite = np.logical_and.reduce([np.isfinite(array) for array in arrays])
+        results = np.empty_like(arrays[0])
+        valid = np.empty(arrays[0].shape[0], dtype=np.bool_)
+        
+        # Apply the same lower bounds as the scalar path, as enabled by the ontology
+        enabled = np.array([bool(variable.check) and getattr(spec, variable.check) for variable in variables])
+        strict = np.array([variable.strict for variable in variables])
+        _kernels.lower_bounds_batch(np.stack(arrays), enabled, strict, valid)
+        
+        kernel = getattr(_kernels, _BATCH_KERNELS[formula_type])
+        kernel(*arrays, results)
+        valid &= finite
+        return results, valid
     
-    def _validate_kinetic_energy(self, formula):
+    def parse_and_validate_values(self, formula_type, normalized_formula):
         """
-        Validate Kinetic Energy formula with ontology constraints
-        """
-        # Regex to extract mass and velocity
-        match = re.match(r'KE=0.5\*(\d+(\.\d+)?)\*(\d+(\.\d+)?)\^2', formula)
-        
-        if not match:
-            raise ValueError("Invalid Kinetic Energy formula")
-        
-        mass = float(match.group(1))
-        velocity = float(match.group(3))
-        
-        # Apply value constraints from ontology
-        validator_info = self.validators.get('KineticEnergyValidator', {})
-        value_constraints = validator_info.get('value_constraints', [])
-        
-        # Check mass and velocity constraints
-        if 'Mass (m) must be a positive number greater than 0' in value_constraints:
-            if mass <= 0:
-                raise ValueError("Mass must be a positive number greater than 0")
-        
-        if 'Velocity (v) must be non-negative' in value_constraints:
-            if velocity < 0:
-                raise ValueError("Velocity must be non-negative")
+        Parse and validate formula values dynamically based on ontology constraints
         
-        # Calculate kinetic energy
-        kinetic_energy = 0.5 * mass * (velocity ** 2)
-        return kinetic_energy, {'mass': mass, 'velocity': velocity}
-    
-    def _validate_ohms_law(self, formula):
-        """
-        Validate Ohm's Law formula with ontology constraints
+        The formula must already have its whitespace removed, as validate_formula does.
         """
-        # Regex to extract current and resistance
-        match = re.match(r'V=(\d+(\.\d+)?)\*(\d+(\.\d+)?)', formula)
-        
-        if not match:
-            raise ValueError("Invalid Ohm's Law formula")
-        
-        current = float(match.group(1))
-        resistance = float(match.group(3))
-        
-        # Apply value constraints from ontology
-        validator_info = self.validators.get('OhmsLawValidator', {})
-        value_constraints = validator_info.get('value_constraints', [])
-        
-        # Check current and resistance constraints
-        if 'Current (I) must be non-negative' in value_constraints:
-            if current < 0:
-                raise ValueError("Current must be non-negative")
-        
-        if 'Resistance (R) must be a positive number greater than 0' in value_constraints:
-            if resistance <= 0:
-                raise ValueError("Resistance must be a positive number greater than 0")
+        # Get the appropriate validation strategy
+        strategy = self._strategies.get(formula_type)
+        if not strategy:
+            raise ValueError("No validation strategy found")
         
-        # Calculate voltage
-        voltage = current * resistance
-        return voltage, {'current': current, 'resistance': resistance}
+        return strategy(normalized_formula)
     
-    def _validate_ideal_gas_law(self, formula):
+    def _validate(self, spec, formula):
         """
-        Validate Ideal Gas Law formula with ontology constraints
+        Scan a formula's operands, apply its ontology value constraints and compute the result
         """
-        # Regex to extract n, R, and T
-        match = re.match(r'PV=(\d+(\.\d+)?)\*(\d+(\.\d+)?)\*(\d+(\.\d+)?)', formula)
-        
-        if not match:
-            raise ValueError("Invalid Ideal Gas Law formula")
+        formula_spec = spec.formula
         
-        n = float(match.group(1))   # moles
-        R = float(match.group(3))   # gas constant
-        T = float(match.group(5))   # temperature
+        # Scan the operands out of the fixed-shape formula
+        try:
+            if not (formula.startswith(formula_spec.prefix) and formula.endswith(formula_spec.suffix)):
+                raise ValueError
+            parts = formula[len(formula_spec.prefix):len(formula) - len(formula_spec.suffix)].split('*')
+            if len(parts) != len(formula_spec.variables):
+                raise ValueError
+            values = {variable.name: _scan_number(part) for variable, part in zip(formula_spec.variables, parts)}
+        except ValueError:
+            raise ValueError(f"Invalid {formula_spec.label} formula")
         
         # Apply value constraints from ontology
-        validator_info = self.validators.get('IdealGasLawValidator', {})
-        value_constraints = validator_info.get('value_constraints', [])
-        
-        # Check value constraints
-        if 'Number of Moles (n) must be a positive number greater than 0' in value_constraints:
-            if n <= 0:
-                raise ValueError("Number of moles must be a positive number greater than 0")
-        
-        if 'Gas Constant (R) must be a positive number greater than 0' in value_constraints:
-            if R <= 0:
-                raise ValueError("Gas constant must be a positive number greater than 0")
-        
-        if 'Temperature (T) must be non-negative (absolute temperature in Kelvin)' in value_constraints:
-            if T < 0:
-                raise ValueError("Temperature must be non-negative (absolute temperature in Kelvin)")
-        
-        # Calculate pressure * volume
-        pv = n * R * T
-        return pv, {'n': n, 'R': R, 'T': T}
+        for variable in formula_spec.variables:
+            if variable.check and getattr(spec, variable.check):
+                value = values[variable.name]
+                if variable.strict:
+                    out_of_range = value <= 0
+                else:
+                    out_of_range = value < 0
+                if out_of_range:
+                    raise ConstraintError(variable.error)
+        
+        return formula_spec.compute(values), values
 
 # Flask Application
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Serialize JSON responses with orjson instead of the standard library encoder
+    
+    Non-string keys and the debug-mode indent are honoured as json.dumps would, but
+    non-ASCII text is written as UTF-8 rather than \\u escapes (ensure_ascii is ignored).
+    """
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+limiter = Limiter(get_remote_address, app=app, storage_uri="memory://")
 
 # Global variable to store validator and mastery
 class AppState:
     def __init__(self):
-        # Hardcoded ontology path 
-        ontology_path = os.path.join(os.path.dirname(__file__), 'smart_physics_tutor.owl')
-        self.validator = PhysicsFormulaValidator(ontology_path)
+        # Check that owlready2's compiled (Cython) parser is available
+        self.check_optimized_parser()
+        
+        self.validator = PhysicsFormulaValidator(_ONTOLOGY_PATH)
         self.mastery_level = 0
+        self._lock = threading.Lock()
+    
+    def update_mastery(self, is_valid):
+        """
+        Atomically adjust the mastery level after a validation and return the new level
+        """
+        with self._lock:
+            if is_valid:
+                self.mastery_level = min(self.mastery_level + 10, 100)
+            else:
+                self.mastery_level = max(self.mastery_level - 5, 0)
+            return self.mastery_level
+    
+    @staticmethod
+    def check_optimized_parser():
+        """
+        Report whether owlready2 will parse the ontology with its compiled parser
+        """
+        if importlib.util.find_spec('owlready2_optimized') is not None:
+            print("Ontology Parser: using compiled owlready2_optimized parser")
+            return True
+        else:
+            print("Ontology Parser Warning: owlready2_optimized is not available, "
+                  "falling back to the slower pure-Python parser. "
+                  "Install Cython>=0.29 and reinstall owlready2 to build it.")
+            return False
 
 app_state = AppState()
 
 @app.route('/')
 def index():
     """
-    Render the main page
+    Serve the static main page
+    """
+    return app.send_static_file('index.html')
+
+@app.route('/mastery')
+def mastery():
+    """
+    Report the current mastery level for the main page
     """
-    return render_template('index.html', 
-                           mastery_level=app_state.mastery_level,
-                           ontology_file=os.path.basename(os.path.join(os.path.dirname(__file__), 'smart_physics_tutor.owl')))
+    return jsonify(mastery_level=app_state.mastery_level, ontology_file=_ONTOLOGY_BASENAME)
 
 @app.route('/validate', methods=['POST'])
+@limiter.limit(VALIDATE_RATE_LIMIT, deduct_when=lambda response: response.status_code == 400)
 def validate_formula():
     """
     Validate the submitted formula
@@ -276,21 +513,35 @@ def validate_formula():
     formula = request.form.get('formula', '')
     formula_type = request.form.get('formula_type', 'NewtonSecondLawValidator')
     
+    # Reject empty or oversized input before it reaches the validator
+    if not formula or len(formula) > MAX_FORMULA_LENGTH:
+        return jsonify({
+            'is_valid': False,
+            'message': f"Formula must be between 1 and {MAX_FORMULA_LENGTH} characters",
+            'mastery_level': app_state.mastery_level
+        }), 400
+    
     # Validate formula
-    is_valid, message = app_state.validator.validate_formula(formula_type, formula)
+    is_valid, message, failure = app_state.validator.check_formula(formula_type, formula)
     
     # Update mastery level
+    mastery_level = app_state.update_mastery(is_valid)
+    
+    # Malformed input is a 400 and counts towards the rate limit; a well-formed
+    # formula that breaks a value constraint is just a wrong answer (422)
     if is_valid:
-        app_state.mastery_level = min(app_state.mastery_level + 10, 100)
+        status = 200
+    elif failure == FAILURE_CONSTRAINT:
+        status = 422
     else:
-        app_state.mastery_level = max(app_state.mastery_level - 5, 0)
+        status = 400
     
     # Return results
     return jsonify({
         'is_valid': is_valid,
         'message': message,
-        'mastery_level': app_state.mastery_level
-    })
+        'mastery_level': mastery_level
+    }), status
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The application is a single top-level module
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
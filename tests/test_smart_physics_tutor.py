@@ -0,0 +1,241 @@
+import dataclasses
+import os
+import shutil
+import sys
+
+import pytest
+
+import smart_physics_tutor
+
+
+@pytest.fixture(scope='module')
+def validator(tmp_path_factory):
+    cache_path = tmp_path_factory.mktemp('cache') / 'physics_tutor.sqlite3'
+    validator = smart_physics_tutor.PhysicsFormulaValidator(smart_physics_tutor._ONTOLOGY_PATH, str(cache_path))
+    yield validator
+    validator.close()
+
+
+@pytest.fixture
+def ontology_copy(tmp_path):
+    ontology_path = tmp_path / 'smart_physics_tutor.owl'
+    shutil.copy(smart_physics_tutor._ONTOLOGY_PATH, ontology_path)
+    return str(ontology_path), str(tmp_path / 'physics_tutor.sqlite3')
+
+
+def build_validator(ontology_path, cache_path):
+    validator = smart_physics_tutor.PhysicsFormulaValidator(ontology_path, cache_path)
+    assert validator.validate_formula('OhmsLawValidator', 'V=2*3')[0]
+    validator.close()
+
+
+def test_cache_is_built_then_reused(ontology_copy):
+    ontology_path, cache_path = ontology_copy
+    build_validator(ontology_path, cache_path)
+    assert os.path.exists(cache_path) and os.path.exists(f"{cache_path}.iri")
+    built = os.stat(cache_path).st_mtime_ns
+    
+    build_validator(ontology_path, cache_path)
+    assert os.stat(cache_path).st_mtime_ns == built
+
+
+def test_stale_cache_is_rebuilt(ontology_copy):
+    ontology_path, cache_path = ontology_copy
+    build_validator(ontology_path, cache_path)
+    os.utime(cache_path, (0, 0))
+    
+    build_validator(ontology_path, cache_path)
+    assert os.stat(cache_path).st_mtime > 0
+
+
+def test_cache_without_iri_file_is_rebuilt(ontology_copy):
+    ontology_path, cache_path = ontology_copy
+    build_validator(ontology_path, cache_path)
+    os.remove(f"{cache_path}.iri")
+    
+    build_validator(ontology_path, cache_path)
+    assert os.path.exists(f"{cache_path}.iri")
+
+
+def test_unusable_cache_location_falls_back_to_memory(ontology_copy, tmp_path):
+    ontology_path, _ = ontology_copy
+    cache_path = str(tmp_path / 'missing' / 'physics_tutor.sqlite3')
+    build_validator(ontology_path, cache_path)
+    assert not os.path.exists(cache_path)
+
+
+@pytest.mark.parametrize('formula_type, formula, expected', [
+    ('NewtonSecondLawValidator', 'F = 2 * 3', 6.0),
+    ('NewtonSecondLawValidator', 'F=2.5*0', 0.0),
+    ('KineticEnergyValidator', 'KE = 0.5 * 2 * 3^2', 9.0),
+    ('KineticEnergyValidator', 'KE=0.5*2*22^2', 484.0),
+    ('OhmsLawValidator', 'V = 2.5 * 4', 10.0),
+    ('IdealGasLawValidator', 'PV = 1 * 8.314 * 300', 2494.2),
+    ('NewtonSecondLawValidator', 'F=2*3\n', 6.0),
+    ('NewtonSecondLawValidator', 'F=2\t*3', 6.0),
+    ('OhmsLawValidator', '\tV = 2 *\r\n4 ', 8.0),
+])
+def test_valid_formulas(validator, formula_type, formula, expected):
+    is_valid, message = validator.validate_formula(formula_type, formula)
+    assert is_valid
+    assert message.startswith(f"Calculation Successful! Result = {expected:.2f}\n")
+
+
+@pytest.mark.parametrize('formula_type, formula, error', [
+    ('NewtonSecondLawValidator', 'F=0*3', "Mass must be a positive number greater than 0"),
+    ('KineticEnergyValidator', 'KE=0.5*0*3^2', "Mass must be a positive number greater than 0"),
+    ('OhmsLawValidator', 'V=2*0', "Resistance must be a positive number greater than 0"),
+    ('IdealGasLawValidator', 'PV=0*8.314*300', "Number of moles must be a positive number greater than 0"),
+    ('IdealGasLawValidator', 'PV=1*0*300', "Gas constant must be a positive number greater than 0"),
+])
+def test_value_constraints(validator, formula_type, formula, error):
+    assert validator.validate_formula(formula_type, formula) == (False, error)
+
+
+@pytest.mark.parametrize('formula_type, formula', [
+    ('NewtonSecondLawValidator', 'F=2*x'),
+    ('NewtonSecondLawValidator', 'F=-1*3'),
+    ('NewtonSecondLawValidator', 'F=1e3*3'),
+    ('NewtonSecondLawValidator', 'F=nan*3'),
+    ('NewtonSecondLawValidator', 'F=2*3*4'),
+    ('KineticEnergyValidator', 'KE=0.5*2*inf^2'),
+    ('KineticEnergyValidator', 'KE=0.5*2*3'),
+    ('OhmsLawValidator', 'V=2*'),
+    ('IdealGasLawValidator', 'PV=1*2'),
+])
+def test_pattern_mismatch(validator, formula_type, formula):
+    is_valid, message = validator.validate_formula(formula_type, formula)
+    assert not is_valid
+    assert message.startswith("Formula must match pattern: ")
+
+
+def test_unsupported_formula_type(validator):
+    assert validator.validate_formula('Bogus', 'F=1*2') == (False, "Unsupported formula type")
+
+
+@pytest.mark.parametrize('formula_type, formula, error', [
+    ('NewtonSecondLawValidator', 'F=nan*3', "Invalid Newton's Second Law formula"),
+    ('NewtonSecondLawValidator', 'F=-1*3', "Invalid Newton's Second Law formula"),
+    ('NewtonSecondLawValidator', 'F=1e3*3', "Invalid Newton's Second Law formula"),
+    ('NewtonSecondLawValidator', 'F=2.*3', "Invalid Newton's Second Law formula"),
+    ('NewtonSecondLawValidator', 'F=2*3*4', "Invalid Newton's Second Law formula"),
+    ('KineticEnergyValidator', 'KE=0.5*2*inf^2', "Invalid Kinetic Energy formula"),
+    ('KineticEnergyValidator', 'KE=0.5*2*3', "Invalid Kinetic Energy formula"),
+    ('OhmsLawValidator', 'F=1*2', "Invalid Ohm's Law formula"),
+    ('IdealGasLawValidator', 'PV=1*2', "Invalid Ideal Gas Law formula"),
+])
+def test_scanner_rejects_malformed_operands(validator, formula_type, formula, error):
+    with pytest.raises(ValueError, match=error):
+        validator.parse_and_validate_values(formula_type, formula)
+
+
+@pytest.mark.parametrize('formula_type, formula, failure', [
+    ('NewtonSecondLawValidator', 'F=2*3', None),
+    ('NewtonSecondLawValidator', 'F=0*3', smart_physics_tutor.FAILURE_CONSTRAINT),
+    ('NewtonSecondLawValidator', 'F=x', smart_physics_tutor.FAILURE_MALFORMED),
+    ('KineticEnergyValidator', 'KE=0x5*2*3^2', smart_physics_tutor.FAILURE_MALFORMED),
+    ('Bogus', 'F=1*2', smart_physics_tutor.FAILURE_UNSUPPORTED),
+])
+def test_check_formula_failure_kinds(validator, formula_type, formula, failure):
+    assert validator.check_formula(formula_type, formula)[2] == failure
+
+
+def test_scanner_returns_parsed_values(validator):
+    assert validator.parse_and_validate_values('IdealGasLawValidator', 'PV=2*0.5*300') == (
+        300.0, {'n': 2.0, 'R': 0.5, 'T': 300.0}
+    )
+
+
+@pytest.fixture
+def client():
+    smart_physics_tutor.limiter.reset()
+    return smart_physics_tutor.app.test_client()
+
+
+def test_validate_status_codes(client):
+    assert client.post('/validate', data={'formula': 'F=2*3'}).status_code == 200
+    assert client.post('/validate', data={'formula': 'F=0*3'}).status_code == 422
+    assert client.post('/validate', data={'formula': 'F=x'}).status_code == 400
+    assert client.post('/validate', data={'formula': 'KE=0x5*2*3^2', 'formula_type': 'KineticEnergyValidator'}).status_code == 400
+    assert client.post('/validate', data={'formula': 'F=1*2', 'formula_type': 'Bogus'}).status_code == 400
+    assert client.post('/validate', data={'formula': ''}).status_code == 400
+
+
+def test_wrong_answers_are_not_throttled(client):
+    for _ in range(100):
+        assert client.post('/validate', data={'formula': 'F=0*3'}).status_code == 422
+    assert client.post('/validate', data={'formula': 'F=2*3'}).status_code == 200
+
+
+def test_malformed_input_is_throttled(client):
+    for _ in range(60):
+        assert client.post('/validate', data={'formula': 'F=x'}).status_code == 400
+    assert client.post('/validate', data={'formula': 'F=2*3'}).status_code == 429
+
+
+def test_rules_are_read_only(validator):
+    with pytest.raises(TypeError):
+        validator.validators['OhmsLawValidator']['formula_pattern'] = 'x'
+    with pytest.raises(TypeError):
+        validator.validators['OhmsLawValidator'] = None
+    assert isinstance(validator.validators['OhmsLawValidator']['value_constraints'], tuple)
+
+
+def test_batch_matches_scalar_validation(validator):
+    results, valid = validator.validate_batch('IdealGasLawValidator', [1, 0, 2], [8.314, 8.314, 0.5], [300, 300, 0])
+    assert results.tolist() == pytest.approx([2494.2, 0.0, 0.0])
+    assert valid.tolist() == [True, False, True]
+    
+    results, valid = validator.validate_batch('KineticEnergyValidator', [2, 0, 2], [3, 3, -1])
+    assert results.tolist() == [9.0, 0.0, 1.0]
+    assert valid.tolist() == [True, False, False]
+
+
+def test_batch_respects_disabled_checks(validator):
+    results, valid = validator.validate_batch('OhmsLawValidator', [-1, 2], [2, 0])
+    assert valid.tolist() == [False, False]
+    
+    spec = validator._specs['OhmsLawValidator']
+    validator._specs['OhmsLawValidator'] = dataclasses.replace(
+        spec, current_nonneg=False, resistance_positive=False
+    )
+    try:
+        results, valid = validator.validate_batch('OhmsLawValidator', [-1, 2], [2, 0])
+    finally:
+        validator._specs['OhmsLawValidator'] = spec
+    assert results.tolist() == [-2.0, 0.0]
+    assert valid.tolist() == [True, True]
+
+
+def test_batch_marks_non_finite_operands_invalid(validator):
+    nan, inf = float('nan'), float('inf')
+    _, valid = validator.validate_batch('KineticEnergyValidator', [nan, 1, 2], [1, inf, 3])
+    assert valid.tolist() == [False, False, True]
+
+
+@pytest.mark.parametrize('formula_type, operands, error', [
+    ('Bogus', ([1], [2]), "Unsupported formula type"),
+    ('IdealGasLawValidator', ([1], [2]), "expects 3 operand arrays"),
+    ('NewtonSecondLawValidator', ([1, 0, 3], [2]), "same length"),
+    ('NewtonSecondLawValidator', ([[1, 2]], [[1, 2]]), "one-dimensional"),
+])
+def test_batch_rejects_bad_operands(validator, formula_type, operands, error):
+    with pytest.raises(ValueError, match=error):
+        validator.validate_batch(formula_type, *operands)
+
+
+def test_batch_without_numba(validator, monkeypatch):
+    # Re-import the kernels with numba unavailable so they run as plain Python loops
+    monkeypatch.setitem(sys.modules, 'numba', None)
+    monkeypatch.delitem(sys.modules, '_kernels', raising=False)
+    results, valid = validator.validate_batch('NewtonSecondLawValidator', [2, 0], [3, 3])
+    assert not hasattr(sys.modules['_kernels'].newton_batch, 'py_func')
+    assert results.tolist() == [6.0, 0.0]
+    assert valid.tolist() == [True, False]
+
+
+def test_json_provider_matches_stdlib_options():
+    app = smart_physics_tutor.app
+    with app.app_context():
+        assert app.json.dumps({2: 'a', 'b': 1}) == '{"2":"a","b":1}'
+        assert app.json.dumps({'a': [1]}, indent=2) == '{\n  "a": [\n    1\n  ]\n}'